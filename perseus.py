@@ -1,18 +1,358 @@
 #!/usr/bin/env python3
 
 import os
+import re
 import argparse
+import bisect
+import errno
+import mmap
+import shutil
 import sys
-from typing import List, Dict, Tuple, Optional, Callable
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from io import StringIO
+from typing import List, Dict, Tuple, Optional, Callable, Iterator, AnyStr
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+WRITE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Files below this size are cheaper to read() than to map
+MMAP_THRESHOLD = 64 * 1024
+# Larger candidates are generated data or fixtures rather than hand-written tests
+MAX_FILESIZE = 4 * 1024 * 1024
+# A NUL byte this close to the start marks a file as binary, as in ripgrep
+BINARY_SNIFF = 4096
+# Upper bound (in characters) on matched file contents kept around for the bulk operations
+CACHE_LIMIT = 64 * 1024 * 1024
+# Python files with 'test' (any case) in their name
+TEST_FILE_RE = re.compile(r'(?i:test).*\.py\Z', re.DOTALL)
+# Line endings as universal newlines mode sees them
+EOL_RE = re.compile(r'\r\n?|\n')
+EOL_RE_B = re.compile(rb'\r\n?|\n')
+
+
+def _read_all(filepath: str) -> bytes:
+    """Read a whole file in one unbuffered call"""
+    with open(filepath, 'rb', buffering=0) as f:
+        return f.readall()
+
+
+def _write_fd(fd: int, data: bytes):
+    """Write all of data to a file descriptor and flush it to disk"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+    os.fsync(fd)
+
+
+def _write_in_place(filepath: str, data: bytes):
+    """Truncate a file and write data into it, keeping its inode and everything attached to it"""
+    fd = os.open(filepath, os.O_WRONLY | os.O_TRUNC | getattr(os, 'O_BINARY', 0))
+    try:
+        _write_fd(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _can_recreate(st: os.stat_result) -> bool:
+    """Whether a file we create can be given the owner and group in st"""
+    if not hasattr(os, 'geteuid'):
+        return True
+    euid = os.geteuid()
+    return euid == 0 or (st.st_uid == euid and (st.st_gid == os.getegid() or st.st_gid in os.getgroups()))
+
+
+def _write_atomic(filepath: str, data: bytes):
+    """Replace a file's contents with one write to a temp file renamed over it
+
+    The rename only needs a writable directory, so files we may not write are refused up front. Files
+    with other hardlinks, owned by someone a new file can't be handed to, or in a directory we can't
+    create files in are rewritten in place.
+    """
+    filepath = os.path.realpath(filepath)
+    st = os.stat(filepath)
+    if not os.access(filepath, os.W_OK):
+        raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), filepath)
+    directory, name = os.path.split(filepath)
+    if st.st_nlink > 1 or not _can_recreate(st) or not os.access(directory, os.W_OK | os.X_OK):
+        _write_in_place(filepath, data)
+        return
+
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    except PermissionError:
+        # Refusals access() doesn't predict, such as an immutable directory
+        _write_in_place(filepath, data)
+        return
+    try:
+        try:
+            if hasattr(os, 'fchown'):
+                tmp_st = os.fstat(fd)
+                if (tmp_st.st_uid, tmp_st.st_gid) != (st.st_uid, st.st_gid):
+                    os.fchown(fd, st.st_uid, st.st_gid)
+            # Mode, flags and extended attributes (ACLs included); the write below refreshes mtime
+            shutil.copystat(filepath, tmp)
+            _write_fd(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(tmp, filepath)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+def _iter_test_files(top: str) -> Iterator[str]:
+    """Yield test file paths under top in os.walk order, straight from os.scandir entries"""
+    stack = [top]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif TEST_FILE_RE.search(entry.name):
+                        yield entry.path
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
+def _split_lines(text: str) -> List[str]:
+    """Split text into lines the way readlines() does, keeping line endings"""
+    return StringIO(text, newline='').readlines()
+
+
+def _line_ending(text: str) -> str:
+    """The line ending text already uses (its first one), or the platform's for text without any"""
+    m = EOL_RE.search(text)
+    return m.group() if m else os.linesep
+
+
+def _lines_containing(lines: List[str], keyword: str, first_only: bool = False) -> List[int]:
+    """Indices of lines containing keyword (only the first one if first_only)"""
+    if first_only:
+        first = next((i for i, line in enumerate(lines) if keyword in line), None)
+        return [] if first is None else [first]
+    return [i for i, line in enumerate(lines) if keyword in line]
+
+
+def _insert_lines(lines: List[str], positions: List[int], new_line: str) -> str:
+    """Join lines back into text with new_line inserted before each (ascending) position"""
+    out = []
+    prev = 0
+    for pos in positions:
+        out.extend(lines[prev:pos])
+        out.append(new_line)
+        prev = pos
+    out.extend(lines[prev:])
+    return ''.join(out)
+
+
+def _diff_blocks(old: List[str], new: List[str]) -> Optional[List[Tuple[int, int, int, int]]]:
+    """Changed blocks (i1, i2, j1, j2) between two line lists, found in linear time
+
+    Works for the edits bulk operations make (lines substituted in place, or only inserted, or only
+    removed); returns None for anything else.
+    """
+    if len(old) == len(new):
+        blocks = []
+        i, n = 0, len(old)
+        while i < n:
+            if old[i] == new[i]:
+                i += 1
+                continue
+            start = i
+            while i < n and old[i] != new[i]:
+                i += 1
+            blocks.append((start, i, start, i))
+        return blocks
+
+    # Greedily match the shorter list inside the longer one; what's left over was inserted (or removed)
+    longer, shorter = (new, old) if len(new) > len(old) else (old, new)
+    gaps = []
+    i = j = 0
+    while j < len(longer):
+        if i < len(shorter) and shorter[i] == longer[j]:
+            i += 1
+            j += 1
+            continue
+        start = j
+        while j < len(longer) and (i >= len(shorter) or shorter[i] != longer[j]):
+            j += 1
+        gaps.append((i, start, j))
+    if i < len(shorter):
+        return None
+    if longer is new:
+        return [(at, at, start, end) for at, start, end in gaps]
+    return [(start, end, at, at) for at, start, end in gaps]
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Line range as written in a unified diff hunk header"""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def _unified_diff(old: List[str], new: List[str], context: int = 2) -> Iterator[str]:
+    """Unified diff built straight from known changed blocks, without running SequenceMatcher"""
+    blocks = _diff_blocks(old, new)
+    if blocks is None:
+        from difflib import unified_diff
+        yield from unified_diff(old, new, n=context)
+        return
+    if not blocks:
+        return
+
+    # Blocks closer than two contexts apart share a hunk, as in difflib
+    groups = [[blocks[0]]]
+    for block in blocks[1:]:
+        if block[0] - groups[-1][-1][1] <= 2 * context:
+            groups[-1].append(block)
+        else:
+            groups.append([block])
+
+    yield '--- \n'
+    yield '+++ \n'
+    for group in groups:
+        i1 = max(group[0][0] - context, 0)
+        j1 = group[0][2] - (group[0][0] - i1)
+        i2 = min(group[-1][1] + context, len(old))
+        j2 = group[-1][3] + (i2 - group[-1][1])
+        yield f"@@ -{_format_range(i1, i2)} +{_format_range(j1, j2)} @@\n"
+        pos = i1
+        for a1, a2, b1, b2 in group:
+            for line in old[pos:a1]:
+                yield ' ' + line
+            for line in old[a1:a2]:
+                yield '-' + line
+            for line in new[b1:b2]:
+                yield '+' + line
+            pos = a2
+        for line in old[pos:i2]:
+            yield ' ' + line
+
+
+def _line_pattern(keyword: str) -> Optional['re.Pattern']:
+    """Compile a case-insensitive pattern for whole lines (with their ending) containing keyword"""
+    if not keyword or '\n' in keyword or '\r' in keyword:
+        return None
+    return re.compile(r'(?<![^\r\n])[^\r\n]*' + re.escape(keyword) + r'[^\r\n]*(?:\r\n|\r|\n)?', re.IGNORECASE)
+
+
+def _scan_lines(text: AnyStr, pattern: 're.Pattern', source: Optional[AnyStr] = None) -> List[Tuple[int, AnyStr]]:
+    """Return (line number, stripped line) for every line of text where pattern matches
+
+    Lines are sliced from source when given, which must have the same offsets as text.
+    """
+    # Hot kernel: self-contained and working on locals only, so it can be swapped for a compiled one
+    if source is None:
+        source = text
+    is_bytes = isinstance(text, bytes)
+    find = text.find
+    search = pattern.search
+    bisect_left = bisect.bisect_left
+    size = len(text)
+
+    # Map each hit back to its line through the line end offsets instead of rescanning line by line.
+    # Lines end at \n, \r\n or a lone \r like readlines() in text mode; without any \r every ending is
+    # one \n, so the next line starts one past it and plain find() is enough to collect them
+    ends = array('q')
+    starts = None
+    append = ends.append
+    if find(b'\r' if is_bytes else '\r') == -1:
+        newline = b'\n' if is_bytes else '\n'
+        pos = find(newline)
+        while pos != -1:
+            append(pos)
+            pos = find(newline, pos + 1)
+    else:
+        starts = array('q')
+        for m in (EOL_RE_B if is_bytes else EOL_RE).finditer(text):
+            append(m.start())
+            starts.append(m.end())
+    end_count = len(ends)
+    last_start = (ends[-1] + 1 if starts is None else starts[-1]) if end_count else 0
+    line_count = end_count + (1 if last_start < size else 0)
+
+    # One hit is enough per line, so resume the search at the start of the next line
+    hits = []
+    m = search(text)
+    while m is not None:
+        i = bisect_left(ends, m.start())
+        if i >= line_count:
+            break
+        if starts is None:
+            start = ends[i - 1] + 1 if i else 0
+        else:
+            start = starts[i - 1] if i else 0
+        end = ends[i] if i < end_count else size
+        hits.append((i + 1, source[start:end].strip()))
+        if i + 1 >= line_count:
+            break
+        m = search(text, end + 1 if starts is None else starts[i])
+    return hits
+
+
+def _read_text(filepath: str, size: int) -> Optional[str]:
+    """Read a file of the given size as UTF-8 text, or None if it looks binary"""
+    if size < MMAP_THRESHOLD:
+        raw = _read_all(filepath)
+        return None if raw.find(b'\0', 0, BINARY_SNIFF) != -1 else raw.decode('utf-8')
+    # Decode large files straight from a memory map
+    with open(filepath, 'rb', buffering=0) as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return None if mm.find(b'\0', 0, BINARY_SNIFF) != -1 else str(mm, 'utf-8')
 
 
 class Perseus:
-    def __init__(self, search_path: str, keywords: List[str], exclude_keywords: Optional[List[str]] = None):
-        """Initialize with search path and keywords to find"""
+    def __init__(self, search_path: str, keywords: List[str], exclude_keywords: Optional[List[str]] = None,
+                 workers: int = DEFAULT_WORKERS, max_bytes: int = MAX_FILESIZE):
+        """Initialize with search path, keywords to find and scan limits (parallel files, max file size)"""
         self.search_path = os.path.abspath(search_path)
+        self.workers = max(1, workers)
+        self.max_bytes = max_bytes
         self.keywords = [k.lower() for k in keywords]
         self.exclude_keywords = [k.lower() for k in exclude_keywords] if exclude_keywords else []
         self.matches: Dict[str, List[Tuple[int, str]]] = {}
+        self._keyword_re = self._compile_any(self.keywords)
+        self._exclude_re = self._compile_any(self.exclude_keywords)
+        # Longer keywords are usually rarer, so checking them first rejects most files after one scan
+        self._keyword_res = [re.compile(re.escape(k), re.IGNORECASE)
+                             for k in sorted(self.keywords, key=len, reverse=True)]
+        # ASCII-only keywords can be matched on raw bytes lowered through a translate table,
+        # which skips Unicode case mapping and decoding for every file that doesn't match
+        self._ascii_mode = all(k.isascii() for k in self.keywords + self.exclude_keywords)
+        self._lower_tbl = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+        if self._ascii_mode:
+            self._keywords_b = [k.encode('ascii') for k in sorted(self.keywords, key=len, reverse=True)]
+            self._excludes_b = [k.encode('ascii') for k in self.exclude_keywords]
+            self._keyword_re_b = re.compile(b'|'.join(re.escape(k) for k in self._keywords_b))
+        # Contents of matched files, so the bulk operations don't read them a second time
+        self._cache: 'OrderedDict[str, str]' = OrderedDict()
+        self._cache_size = 0
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _compile_any(words: List[str]) -> Optional['re.Pattern']:
+        """Compile words into a single case-insensitive alternation so one pass finds any of them"""
+        if not words:
+            return None
+        # Longest first so overlapping alternatives report the widest hit
+        return re.compile('|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True)), re.IGNORECASE)
 
     def find_matches(self) -> Dict[str, List[Tuple[int, str]]]:
         """Find files containing ALL keywords and NONE of the excluded keywords (anywhere in file)"""
@@ -21,32 +361,101 @@ class Perseus:
         if self.exclude_keywords:
             print(f"Excluding keywords: {self.exclude_keywords}")
 
-        self.matches.clear()
-        for root, _, files in os.walk(self.search_path):
-            for file in files:
-                if file.endswith('.py') and ('test' in file.lower()):
-                    filepath = os.path.join(root, file)
-                    self._process_file(filepath)
+        self._cache.clear()
+        self._cache_size = 0
+        paths = list(_iter_test_files(self.search_path))
+
+        # Each file is an independent read + scan, so overlap them across threads
+        if self.workers > 1 and len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(self._process_file, paths))
+        else:
+            results = [self._process_file(filepath) for filepath in paths]
+
+        # Each file's hits arrive as a finished list, so build the dict once instead of per hit
+        self.matches = {filepath: hits for filepath, hits in zip(paths, results) if hits}
         return self.matches
 
-    def _process_file(self, filepath: str):
-        """Check if file contains all keywords and none of the exclude keywords, and collect matches"""
+    def _process_file(self, filepath: str) -> List[Tuple[int, str]]:
+        """Return matching lines if file contains all keywords and none of the exclude keywords"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read().lower()
-                if all(k in content for k in self.keywords) and not any(ek in content for ek in self.exclude_keywords):
-                    f.seek(0)
-                    for i, line in enumerate(f, 1):
-                        if any(k in line.lower() for k in self.keywords):
-                            self._add_match(filepath, i, line.strip())
+            # Stat first so oversized and binary files are never decoded
+            size = os.stat(filepath).st_size
+            if self._keyword_re is None or size > self.max_bytes:
+                return []
+            if self._ascii_mode:
+                return self._match_bytes(filepath)
+            return self._match_text(filepath, size)
         except Exception as e:
             print(f"Error reading {filepath}: {str(e)}")
-
-    def _add_match(self, filepath: str, line_num: int, line: str):
-        """Store matched lines"""
-        if filepath not in self.matches:
-            self.matches[filepath] = []
-        self.matches[filepath].append((line_num, line))
+            return []
+
+    def _match_bytes(self, filepath: str) -> List[Tuple[int, str]]:
+        """Match ASCII keywords against raw bytes, decoding only files that match"""
+        raw = _read_all(filepath)
+        if raw.find(b'\0', 0, BINARY_SNIFF) != -1:
+            return []
+        lowered = raw.translate(self._lower_tbl)
+        for keyword in self._keywords_b:
+            if lowered.find(keyword) == -1:
+                return []
+        for keyword in self._excludes_b:
+            if lowered.find(keyword) != -1:
+                return []
+
+        text = raw.decode('utf-8')
+        hits = [(line_num, line.decode('utf-8').strip())
+                for line_num, line in _scan_lines(lowered, self._keyword_re_b, raw)]
+        if hits:
+            self._cache_put(filepath, text)
+        return hits
+
+    def _match_text(self, filepath: str, size: int) -> List[Tuple[int, str]]:
+        """Match keywords against decoded text, folding case with Unicode-aware patterns"""
+        # Patterns fold case themselves, so no lowercased copy of the file is made
+        text = _read_text(filepath, size)
+        if text is None:
+            return []
+        for keyword_re in self._keyword_res:
+            if keyword_re.search(text) is None:
+                return []
+        if self._exclude_re is not None and self._exclude_re.search(text):
+            return []
+
+        hits = _scan_lines(text, self._keyword_re)
+        if hits:
+            self._cache_put(filepath, text)
+        return hits
+
+    def _cache_put(self, filepath: str, text: str):
+        """Remember file contents, evicting the least recently used ones past CACHE_LIMIT"""
+        with self._cache_lock:
+            old = self._cache.pop(filepath, None)
+            if old is not None:
+                self._cache_size -= len(old)
+            self._cache[filepath] = text
+            self._cache_size += len(text)
+            while self._cache_size > CACHE_LIMIT and len(self._cache) > 1:
+                self._cache_size -= len(self._cache.popitem(last=False)[1])
+
+    def _cache_drop(self, filepath: str):
+        """Forget cached contents of a file"""
+        with self._cache_lock:
+            old = self._cache.pop(filepath, None)
+            if old is not None:
+                self._cache_size -= len(old)
+
+    def _load(self, filepath: str) -> str:
+        """Return file contents, from the search cache when available"""
+        with self._cache_lock:
+            text = self._cache.get(filepath)
+            if text is not None:
+                self._cache.move_to_end(filepath)
+        if text is None:
+            text = _read_text(filepath, os.path.getsize(filepath))
+            if text is None:
+                raise ValueError("looks like a binary file")
+        return text
 
     def print_results(self):
         """Display found matches"""
@@ -65,11 +474,10 @@ class Perseus:
         resp = input("Continue? [y/N]: ").strip().lower()
         return resp == 'y'
 
-    def _show_changes(self, old: List[str], new: List[str], context: int = 2):
-        """Display diff of changes"""
-        from difflib import unified_diff
+    def _show_changes(self, old: str, new: str, context: int = 2):
+        """Display diff of changes between two file contents"""
         print("\nChanges to be made:")
-        for line in unified_diff(old, new, n=context):
+        for line in _unified_diff(_split_lines(old), _split_lines(new), context):
             if line.startswith('+'):
                 print(f"\033[92m{line}\033[0m")
             elif line.startswith('-'):
@@ -77,17 +485,40 @@ class Perseus:
             else:
                 print(line, end='')
 
-    def bulk_replace(self, old: str, new: str, dry_run: bool = False, bulk_confirm: bool = False) -> int:
-        """Replace text with confirmation and diff preview"""
+    def _write_one(self, filepath: str, updated: str) -> Tuple[str, bool, Optional[str]]:
+        """Write new contents to a file, returning (filepath, success, error message)"""
+        try:
+            _write_atomic(filepath, updated.encode('utf-8'))
+        except Exception as e:
+            return filepath, False, str(e)
+        self._cache_put(filepath, updated)
+        return filepath, True, None
+
+    def _write_all(self, changes: List[Tuple[str, str, str]]) -> int:
+        """Write already confirmed changes concurrently, returning how many files were updated"""
+        # Each write waits on its own fsync, so overlap them across threads
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+            results = list(executor.map(lambda change: self._write_one(change[0], change[2]), changes))
+
+        modified = 0
+        for filepath, ok, error in results:
+            if ok:
+                modified += 1
+                print(f"Updated {filepath}")
+            else:
+                print(f"Error updating {filepath}: {error}")
+        return modified
+
+    def _apply(self, transform: Callable[[str], str], action: str,
+               dry_run: bool = False, bulk_confirm: bool = False) -> int:
+        """Apply transform to every matched file's contents with diff preview and confirmation"""
         modified = 0
         changes = []
 
         for filepath in self.matches:
             try:
-                with open(filepath, 'r') as f:
-                    original = f.readlines()
-
-                updated = [line.replace(old, new) for line in original]
+                original = self._load(filepath)
+                updated = transform(original)
 
                 if original != updated:
                     changes.append((filepath, original, updated))
@@ -99,28 +530,33 @@ class Perseus:
             return 0
 
         print(f"\nFound {len(changes)} files that would be modified:")
-        for filepath, original, updated in changes:
-            print(f"\nFile: {filepath}")
-            self._show_changes(original, updated)
+        if bulk_confirm and not dry_run:
+            # A single yes/no covers every file, so list them rather than rendering each diff
+            for filepath, _, _ in changes:
+                print(f"  - {filepath}")
+        else:
+            for filepath, original, updated in changes:
+                print(f"\nFile: {filepath}")
+                self._show_changes(original, updated)
 
         if not dry_run:
             if bulk_confirm:
-                if not self._confirm_action(f"Replace '{old}' with '{new}' in {len(changes)} files"):
+                if not self._confirm_action(f"{action} in {len(changes)} files"):
                     print("Skipped (user canceled bulk operation)")
                     return 0
+                return self._write_all(changes)
             else:
                 print("\nProcessing files individually...")
 
         for filepath, original, updated in changes:
             if not dry_run:
-                if bulk_confirm or self._confirm_action(f"Replace '{old}' with '{new}' in {filepath}"):
-                    try:
-                        with open(filepath, 'w') as f:
-                            f.writelines(updated)
+                if self._confirm_action(f"{action} in {filepath}"):
+                    _, ok, error = self._write_one(filepath, updated)
+                    if ok:
                         modified += 1
                         print(f"Updated {filepath}")
-                    except Exception as e:
-                        print(f"Error updating {filepath}: {str(e)}")
+                    else:
+                        print(f"Error updating {filepath}: {error}")
                 else:
                     print(f"Skipped {filepath}")
             else:
@@ -128,6 +564,16 @@ class Perseus:
 
         return modified
 
+    def bulk_replace(self, old: str, new: str, dry_run: bool = False, bulk_confirm: bool = False) -> int:
+        """Replace text with confirmation and diff preview"""
+        def transform(text: str) -> str:
+            # Substrings never straddle lines, so one replace over the whole file does it
+            if old and '\n' not in old and '\r' not in old:
+                return text.replace(old, new)
+            return ''.join(line.replace(old, new) for line in _split_lines(text))
+
+        return self._apply(transform, f"Replace '{old}' with '{new}'", dry_run, bulk_confirm)
+
     def bulk_remove_keyword(self, keyword: str, dry_run: bool = False, bulk_confirm: bool = False) -> int:
         """Remove keyword with confirmation"""
         return self.bulk_replace(keyword, "", dry_run, bulk_confirm)
@@ -135,298 +581,63 @@ class Perseus:
     def bulk_add_keyword(self, keyword: str, condition: Optional[Callable[[str], bool]] = None,
                          dry_run: bool = False, bulk_confirm: bool = False) -> int:
         """Add keyword to matching lines with confirmation"""
-        modified = 0
-        changes = []
+        def transform(text: str) -> str:
+            inserted = keyword + _line_ending(text)
+            return ''.join(inserted + line if not condition or condition(line) else line
+                           for line in _split_lines(text))
 
-        for filepath in self.matches:
-            try:
-                with open(filepath, 'r') as f:
-                    original = f.readlines()
-
-                updated = []
-                for line in original:
-                    if not condition or condition(line):
-                        updated.append(f"{keyword}\n{line}")
-                    else:
-                        updated.append(line)
-
-                if original != updated:
-                    changes.append((filepath, original, updated))
-            except Exception as e:
-                print(f"Error processing {filepath}: {str(e)}")
-
-        if not changes:
-            print("No changes needed.")
-            return 0
-
-        print(f"\nFound {len(changes)} files that would be modified:")
-        for filepath, original, updated in changes:
-            print(f"\nFile: {filepath}")
-            self._show_changes(original, updated)
-
-        if not dry_run:
-            if bulk_confirm:
-                if not self._confirm_action(f"Add '{keyword}' in {len(changes)} files"):
-                    print("Skipped (user canceled bulk operation)")
-                    return 0
-            else:
-                print("\nProcessing files individually...")
-
-        for filepath, original, updated in changes:
-            if not dry_run:
-                if bulk_confirm or self._confirm_action(f"Add '{keyword}' in {filepath}"):
-                    try:
-                        with open(filepath, 'w') as f:
-                            f.writelines(updated)
-                        modified += 1
-                        print(f"Updated {filepath}")
-                    except Exception as e:
-                        print(f"Error updating {filepath}: {str(e)}")
-                else:
-                    print(f"Skipped {filepath}")
-            else:
-                print(f"[Dry-run] Would update {filepath}")
-
-        return modified
+        return self._apply(transform, f"Add '{keyword}'", dry_run, bulk_confirm)
 
     def bulk_remove_lines(self, keyword: str, dry_run: bool = False, bulk_confirm: bool = False) -> int:
         """Remove entire lines containing the keyword with confirmation"""
-        modified = 0
-        changes = []
+        pattern = _line_pattern(keyword)
+        keyword_lc = keyword.lower()
 
-        for filepath in self.matches:
-            try:
-                with open(filepath, 'r') as f:
-                    original = f.readlines()
-
-                updated = [line for line in original if keyword.lower() not in line.lower()]
-
-                if len(original) != len(updated):
-                    changes.append((filepath, original, updated))
-            except Exception as e:
-                print(f"Error processing {filepath}: {str(e)}")
+        def transform(text: str) -> str:
+            if pattern is not None:
+                return pattern.sub('', text)
+            return ''.join(line for line in _split_lines(text) if keyword_lc not in line.lower())
 
-        if not changes:
-            print("No changes needed.")
-            return 0
-
-        print(f"\nFound {len(changes)} files that would be modified:")
-        for filepath, original, updated in changes:
-            print(f"\nFile: {filepath}")
-            self._show_changes(original, updated)
-
-        if not dry_run:
-            if bulk_confirm:
-                if not self._confirm_action(f"Remove lines containing '{keyword}' in {len(changes)} files"):
-                    print("Skipped (user canceled bulk operation)")
-                    return 0
-            else:
-                print("\nProcessing files individually...")
-
-        for filepath, original, updated in changes:
-            if not dry_run:
-                if bulk_confirm or self._confirm_action(f"Remove lines containing '{keyword}' in {filepath}"):
-                    try:
-                        with open(filepath, 'w') as f:
-                            f.writelines(updated)
-                        modified += 1
-                        print(f"Updated {filepath}")
-                    except Exception as e:
-                        print(f"Error updating {filepath}: {str(e)}")
-                else:
-                    print(f"Skipped {filepath}")
-            else:
-                print(f"[Dry-run] Would update {filepath}")
-
-        return modified
+        return self._apply(transform, f"Remove lines containing '{keyword}'", dry_run, bulk_confirm)
 
     def bulk_replace_lines(self, old_line: str, new_line: str, dry_run: bool = False,
                            bulk_confirm: bool = False) -> int:
         """Replace entire lines containing old_line with new_line"""
-        modified = 0
-        changes = []
-
-        for filepath in self.matches:
-            try:
-                with open(filepath, 'r') as f:
-                    original = f.readlines()
-
-                updated = []
-                for line in original:
-                    if old_line.lower() in line.lower():
-                        updated.append(new_line + '\n' if not new_line.endswith('\n') else new_line)
-                    else:
-                        updated.append(line)
-
-                if original != updated:
-                    changes.append((filepath, original, updated))
-            except Exception as e:
-                print(f"Error processing {filepath}: {str(e)}")
-
-        if not changes:
-            print("No changes needed.")
-            return 0
-
-        print(f"\nFound {len(changes)} files that would be modified:")
-        for filepath, original, updated in changes:
-            print(f"\nFile: {filepath}")
-            self._show_changes(original, updated)
-
-        if not dry_run:
-            if bulk_confirm:
-                if not self._confirm_action(f"Replace lines containing '{old_line}' in {len(changes)} files"):
-                    print("Skipped (user canceled bulk operation)")
-                    return 0
-            else:
-                print("\nProcessing files individually...")
-
-        for filepath, original, updated in changes:
-            if not dry_run:
-                if bulk_confirm or self._confirm_action(f"Replace lines containing '{old_line}' in {filepath}"):
-                    try:
-                        with open(filepath, 'w') as f:
-                            f.writelines(updated)
-                        modified += 1
-                        print(f"Updated {filepath}")
-                    except Exception as e:
-                        print(f"Error updating {filepath}: {str(e)}")
-                else:
-                    print(f"Skipped {filepath}")
-            else:
-                print(f"[Dry-run] Would update {filepath}")
-
-        return modified
+        pattern = _line_pattern(old_line)
+        old_line_lc = old_line.lower()
+        # Replacements end with the file's own line ending, whichever one new_line came with
+        if new_line.endswith('\r\n'):
+            new_line = new_line[:-2]
+        elif new_line.endswith('\n'):
+            new_line = new_line[:-1]
+
+        def transform(text: str) -> str:
+            replacement = new_line + _line_ending(text)
+            if pattern is not None:
+                return pattern.sub(lambda m: replacement, text)
+            return ''.join(replacement if old_line_lc in line.lower() else line for line in _split_lines(text))
+
+        return self._apply(transform, f"Replace lines containing '{old_line}'", dry_run, bulk_confirm)
 
     def bulk_add_after(self, match_keyword: str, new_line: str, first_only: bool = False,
                        dry_run: bool = False, bulk_confirm: bool = False) -> int:
         """Add a new line after each line containing match_keyword"""
-        modified = 0
-        changes = []
+        def transform(text: str) -> str:
+            lines = _split_lines(text)
+            hits = _lines_containing(lines, match_keyword, first_only)
+            return _insert_lines(lines, [i + 1 for i in hits], new_line + _line_ending(text)) if hits else text
 
-        for filepath in self.matches:
-            try:
-                with open(filepath, 'r') as f:
-                    lines = f.readlines()
-
-                updated_lines = []
-                inserted = False
-
-                for i, line in enumerate(lines):
-                    updated_lines.append(line)
-                    if match_keyword in line:
-                        if first_only and inserted:
-                            continue
-                        updated_lines.append(new_line + '\n')
-                        inserted = True
-                        if first_only:
-                            updated_lines.extend(lines[i + 1:])
-                            break
-
-                if inserted and lines != updated_lines:
-                    changes.append((filepath, lines, updated_lines))
-            except Exception as e:
-                print(f"Error processing {filepath}: {str(e)}")
-
-        if not changes:
-            print("No changes needed.")
-            return 0
-
-        print(f"\nFound {len(changes)} files that would be modified:")
-        for filepath, original, updated in changes:
-            print(f"\nFile: {filepath}")
-            self._show_changes(original, updated)
-
-        if not dry_run:
-            if bulk_confirm:
-                if not self._confirm_action(f"Add line after '{match_keyword}' in {len(changes)} files"):
-                    print("Skipped (user canceled bulk operation)")
-                    return 0
-            else:
-                print("\nProcessing files individually...")
-
-        for filepath, original, updated in changes:
-            if not dry_run:
-                if bulk_confirm or self._confirm_action(f"Add line after '{match_keyword}' in {filepath}"):
-                    try:
-                        with open(filepath, 'w') as f:
-                            f.writelines(updated)
-                        modified += 1
-                        print(f"Updated {filepath}")
-                    except Exception as e:
-                        print(f"Error updating {filepath}: {str(e)}")
-                else:
-                    print(f"Skipped {filepath}")
-            else:
-                print(f"[Dry-run] Would update {filepath}")
-
-        return modified
+        return self._apply(transform, f"Add line after '{match_keyword}'", dry_run, bulk_confirm)
 
     def bulk_add_before(self, match_keyword: str, new_line: str, first_only: bool = False,
                         dry_run: bool = False, bulk_confirm: bool = False) -> int:
         """Add a new line before each line containing match_keyword"""
-        modified = 0
-        changes = []
-
-        for filepath in self.matches:
-            try:
-                with open(filepath, 'r') as f:
-                    lines = f.readlines()
-
-                updated_lines = []
-                inserted = False
-
-                for i, line in enumerate(lines):
-                    if match_keyword in line:
-                        if first_only and inserted:
-                            updated_lines.append(line)
-                            continue
-                        updated_lines.append(new_line + '\n')
-                        inserted = True
-                        updated_lines.append(line)
-                        if first_only:
-                            updated_lines.extend(lines[i + 1:])
-                            break
-                    else:
-                        updated_lines.append(line)
-
-                if inserted and lines != updated_lines:
-                    changes.append((filepath, lines, updated_lines))
-            except Exception as e:
-                print(f"Error processing {filepath}: {str(e)}")
+        def transform(text: str) -> str:
+            lines = _split_lines(text)
+            hits = _lines_containing(lines, match_keyword, first_only)
+            return _insert_lines(lines, hits, new_line + _line_ending(text)) if hits else text
 
-        if not changes:
-            print("No changes needed.")
-            return 0
-
-        print(f"\nFound {len(changes)} files that would be modified:")
-        for filepath, original, updated in changes:
-            print(f"\nFile: {filepath}")
-            self._show_changes(original, updated)
-
-        if not dry_run:
-            if bulk_confirm:
-                if not self._confirm_action(f"Add line before '{match_keyword}' in {len(changes)} files"):
-                    print("Skipped (user canceled bulk operation)")
-                    return 0
-            else:
-                print("\nProcessing files individually...")
-
-        for filepath, original, updated in changes:
-            if not dry_run:
-                if bulk_confirm or self._confirm_action(f"Add line before '{match_keyword}' in {filepath}"):
-                    try:
-                        with open(filepath, 'w') as f:
-                            f.writelines(updated)
-                        modified += 1
-                        print(f"Updated {filepath}")
-                    except Exception as e:
-                        print(f"Error updating {filepath}: {str(e)}")
-                else:
-                    print(f"Skipped {filepath}")
-            else:
-                print(f"[Dry-run] Would update {filepath}")
-
-        return modified
+        return self._apply(transform, f"Add line before '{match_keyword}'", dry_run, bulk_confirm)
 
     def bulk_remove_files(self, dry_run: bool = False, bulk_confirm: bool = False) -> int:
         """Remove entire files that match the search criteria"""
@@ -452,6 +663,7 @@ class Perseus:
                 if bulk_confirm or self._confirm_action(f"Remove file: {filepath}"):
                     try:
                         os.remove(filepath)
+                        self._cache_drop(filepath)
                         removed_count += 1
                         print(f"Removed {filepath}")
                     except Exception as e:
@@ -560,6 +772,10 @@ def main():
                         help="Confirm all changes at once rather than per file")
     parser.add_argument("--remove-file", action="store_true",
                         help="Remove entire files that match the search criteria")
+    parser.add_argument("--max-filesize", type=int, default=MAX_FILESIZE, metavar="BYTES",
+                        help=f"Skip files larger than BYTES (default: {MAX_FILESIZE})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of files to scan in parallel (default: {DEFAULT_WORKERS})")
 
     args = parser.parse_args()
 
@@ -571,7 +787,8 @@ def main():
         parser.print_help()
         sys.exit(1)
 
-    finder = Perseus(args.path, args.keywords, args.exclude_keywords)
+    finder = Perseus(args.path, args.keywords, args.exclude_keywords, workers=args.workers,
+                     max_bytes=args.max_filesize)
     finder.find_matches()
 
     if args.output or args.trim_paths or args.single_line:
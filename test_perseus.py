@@ -1,55 +1,87 @@
 import unittest
 import tempfile
 import os
+import itertools
+import mmap
+import shutil
+import stat
 from unittest.mock import patch
 from io import StringIO
-from typing import List
-from perseus import Perseus
+from typing import Dict, List
+from perseus import Perseus, MMAP_THRESHOLD
+
+# Fixture contents, already encoded so each test writes them as-is
+_CONTENT_OLD = b"line with @old\n"
+_CONTENT_OTHER_OLD = b"other @old text\n"
+_CONTENT_KEEP_REMOVE = b"keep\nremove this\nkeep\n"
+_CONTENT_MATCH = b"line\nmatch\nnext\n"
+_CONTENT_CRLF = b"@mark\r\ndef test():\r\n    pass\r\n"
 
 
 class TestPerseus(unittest.TestCase):
+
     @classmethod
     def setUpClass(cls):
-        print("\n" + "="*60)
-        print("STARTING TEST SUITE".center(60))
-        print("="*60 + "\n")
+        # Stub input() once for the whole class with a plain function; tests only set the answers
+        cls._answers = iter([])
+        cls._input_patcher = patch('builtins.input', new=lambda prompt="": next(cls._answers))
+        cls._input_patcher.start()
+        cls.addClassCleanup(cls._input_patcher.stop)
+        cls._tmpdir = tempfile.mkdtemp()
+        # Removal tests only need a path that exists, so they all link this one empty file
+        cls._empty = os.path.join(cls._tmpdir, "empty")
+        open(cls._empty, "w").close()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls._tmpdir, ignore_errors=True)
 
     def setUp(self):
-        self.test_files = []
-        print("\n")
-        print("-"*50)
-        print(f"\n[START] {self._testMethodName}")
-
-    def tearDown(self):
-        for f in self.test_files:
-            if os.path.exists(f):
-                os.remove(f)
-        print(f"[END] {self._testMethodName}\n")
-
-    def _create_temp_file(self, content: str) -> str:
-        tmp = tempfile.NamedTemporaryFile(delete=False, mode='w+')
-        tmp.write(content)
-        tmp.close()
-        self.test_files.append(tmp.name)
-        return tmp.name
+        # One directory per test: a single rmtree cleans up even if the test fails midway
+        self._td = tempfile.TemporaryDirectory()
+        self.addCleanup(self._td.cleanup)
+        self._counter = itertools.count()
+        type(self)._answers = iter([])
+
+    def _create_temp_file(self, content: bytes) -> str:
+        fd, name = tempfile.mkstemp(dir=self._td.name)
+        os.write(fd, content)
+        os.close(fd)
+        return name
+
+    def _create_temp_files(self, contents: List[bytes]) -> List[str]:
+        return [self._create_temp_file(content) for content in contents]
+
+    def _link_fixture(self) -> str:
+        """Hardlink the shared empty file into a per-test path"""
+        name = os.path.join(self._td.name, f"t{next(self._counter)}")
+        os.link(self._empty, name)
+        return name
+
+    def _create_search_tree(self, files: Dict[str, str]) -> str:
+        root = tempfile.mkdtemp(dir=self._td.name)
+        for name, content in files.items():
+            path = os.path.join(root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Byte-exact on every platform: no newline translation, no locale codepage
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write(content)
+        return root
 
     def _get_finder(self, paths: List[str]):
         """Helper to create finder with mocked matches and confirm_action"""
         finder = Perseus(search_path=".", keywords=["dummy"])
-        finder.matches = paths
+        finder.matches = tuple(paths)
         return finder
 
     def test_bulk_remove_files_confirmed(self):
         """Test file removal with confirmation"""
-        content1 = "test file content\n"
-        content2 = "another test file\n"
-        path1 = self._create_temp_file(content1)
-        path2 = self._create_temp_file(content2)
+        path1, path2 = self._link_fixture(), self._link_fixture()
 
         finder = self._get_finder([path1, path2])
         
-        with patch('builtins.input', return_value='y'):
-            removed = finder.bulk_remove_files(dry_run=False, bulk_confirm=True)
+        type(self)._answers = itertools.repeat('y')
+        removed = finder.bulk_remove_files(dry_run=False, bulk_confirm=True)
 
         self.assertEqual(removed, 2)
         self.assertFalse(os.path.exists(path1))
@@ -58,13 +90,12 @@ class TestPerseus(unittest.TestCase):
 
     def test_bulk_remove_files_aborted(self):
         """Test file removal cancellation"""
-        content = "test file content\n"
-        path = self._create_temp_file(content)
+        path = self._link_fixture()
 
         finder = self._get_finder([path])
         
-        with patch('builtins.input', return_value='n'):
-            removed = finder.bulk_remove_files(dry_run=False, bulk_confirm=True)
+        type(self)._answers = itertools.repeat('n')
+        removed = finder.bulk_remove_files(dry_run=False, bulk_confirm=True)
 
         self.assertEqual(removed, 0)
         self.assertTrue(os.path.exists(path))
@@ -72,13 +103,12 @@ class TestPerseus(unittest.TestCase):
 
     def test_bulk_remove_files_dry_run(self):
         """Test dry run file removal"""
-        content = "test file content\n"
-        path = self._create_temp_file(content)
+        path = self._link_fixture()
 
         finder = self._get_finder([path])
         
-        with patch('builtins.input', return_value='y'):
-            removed = finder.bulk_remove_files(dry_run=True, bulk_confirm=True)
+        type(self)._answers = itertools.repeat('y')
+        removed = finder.bulk_remove_files(dry_run=True, bulk_confirm=True)
 
         self.assertEqual(removed, 0)
         self.assertTrue(os.path.exists(path))
@@ -86,104 +116,393 @@ class TestPerseus(unittest.TestCase):
 
     def test_bulk_remove_files_individual_confirmation(self):
         """Test individual file confirmation"""
-        content1 = "test file 1\n"
-        content2 = "test file 2\n"
-        path1 = self._create_temp_file(content1)
-        path2 = self._create_temp_file(content2)
+        path1, path2 = self._link_fixture(), self._link_fixture()
 
         finder = self._get_finder([path1, path2])
         
-        with patch('builtins.input', side_effect=['y', 'n']):
-            removed = finder.bulk_remove_files(dry_run=False, bulk_confirm=False)
+        type(self)._answers = iter(['y', 'n'])
+        removed = finder.bulk_remove_files(dry_run=False, bulk_confirm=False)
 
         self.assertEqual(removed, 1)
         self.assertFalse(os.path.exists(path1))
         self.assertTrue(os.path.exists(path2))
         print("✓ Correctly handled individual file confirmations")
 
-    # Existing tests remain unchanged...
-    def test_bulk_confirm_replaces_in_all_files(self):
-        """Test bulk replacement with confirmation"""
-        content1 = "line with @old\n"
-        content2 = "other @old text\n"
-        path1 = self._create_temp_file(content1)
-        path2 = self._create_temp_file(content2)
+    def test_bulk_replace_confirmation_modes(self):
+        """Test bulk replacement across confirmation, cancellation, per-file and dry-run modes"""
+        cases = [
+            # (answers, bulk_confirm, dry_run, expected modified)
+            (['y'], True, False, 2),
+            (['n'], True, False, 0),
+            (['y', 'n'], False, False, 1),
+            (['y'], True, True, 0),
+        ]
+        for answers, bulk_confirm, dry_run, expected in cases:
+            with self.subTest(answers=answers, bulk_confirm=bulk_confirm, dry_run=dry_run):
+                paths = self._create_temp_files([_CONTENT_OLD, _CONTENT_OTHER_OLD])
+                finder = self._get_finder(paths)
+
+                type(self)._answers = iter(answers)
+                modified = finder.bulk_replace("@old", "@new", dry_run=dry_run, bulk_confirm=bulk_confirm)
+
+                self.assertEqual(modified, expected)
+        print("✓ Replaced according to each confirmation mode")
+
+    def test_bulk_replace_preview_output(self):
+        """Test bulk confirmation lists files without diffs, while dry runs still render them"""
+        for dry_run in (False, True):
+            with self.subTest(dry_run=dry_run):
+                paths = self._create_temp_files([_CONTENT_OLD, _CONTENT_OTHER_OLD])
+                finder = self._get_finder(paths)
+
+                type(self)._answers = itertools.repeat('y')
+                with patch('sys.stdout', new_callable=StringIO) as out:
+                    finder.bulk_replace("@old", "@new", dry_run=dry_run, bulk_confirm=True)
+
+                for path in paths:
+                    self.assertEqual(f"  - {path}\n" in out.getvalue(), not dry_run)
+                    self.assertEqual(f"File: {path}\n" in out.getvalue(), dry_run)
+                self.assertEqual("Changes to be made:" in out.getvalue(), dry_run)
+                self.assertEqual("+line with @new\n" in out.getvalue(), dry_run)
+        print("✓ Preview listed files or rendered diffs as expected")
+
+    def test_bulk_write_preserves_mode(self):
+        """Test updated files keep their permission bits"""
+        path = self._create_temp_file(_CONTENT_OLD)
+        os.chmod(path, 0o640)
+        finder = self._get_finder([path])
 
-        finder = self._get_finder([path1, path2])
-        
-        with patch('builtins.input', return_value='y'):
-            modified = finder.bulk_replace("@old", "@new", dry_run=False, bulk_confirm=True)
+        type(self)._answers = itertools.repeat('y')
+        self.assertEqual(finder.bulk_replace("@old", "@new", bulk_confirm=True), 1)
 
-        self.assertEqual(modified, 2)
-        print(f"✓ Replaced in {modified} files")
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o640)
+        print("✓ File mode preserved")
 
-    def test_bulk_confirm_aborts_if_user_rejects(self):
-        """Test bulk operation cancellation"""
-        content = "line with @old\n"
-        path = self._create_temp_file(content)
+    def test_bulk_write_refuses_read_only_file(self):
+        """Test read-only files are left alone even though their directory is writable"""
+        path = self._create_temp_file(_CONTENT_OLD)
+        os.chmod(path, 0o444)
+        self.addCleanup(os.chmod, path, 0o644)
+        if os.access(path, os.W_OK):
+            self.skipTest("file permissions are not enforced for this user")
+        finder = self._get_finder([path])
 
+        type(self)._answers = itertools.repeat('y')
+        self.assertEqual(finder.bulk_replace("@old", "@new", bulk_confirm=True), 0)
+
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), _CONTENT_OLD)
+        print("✓ Read-only file refused")
+
+    def test_bulk_write_in_read_only_directory(self):
+        """Test a writable file is still updated when its directory doesn't allow new files"""
+        directory = tempfile.mkdtemp(dir=self._td.name)
+        path = os.path.join(directory, "test_x.py")
+        with open(path, 'wb') as f:
+            f.write(_CONTENT_OLD)
+        os.chmod(path, 0o666)
+        os.chmod(directory, 0o555)
+        self.addCleanup(os.chmod, directory, 0o755)
+        if os.access(directory, os.W_OK):
+            self.skipTest("directory permissions are not enforced for this user")
         finder = self._get_finder([path])
-        
-        with patch('builtins.input', return_value='n'):
-            modified = finder.bulk_replace("@old", "@new", dry_run=False, bulk_confirm=True)
 
-        self.assertEqual(modified, 0)
-        print("✓ Correctly aborted operation")
+        type(self)._answers = itertools.repeat('y')
+        self.assertEqual(finder.bulk_replace("@old", "@new", bulk_confirm=True), 1)
 
-    def test_non_bulk_mode_confirms_per_file(self):
-        """Test individual file confirmation"""
-        content1 = "line with @old\n"
-        content2 = "other @old text\n"
-        path1 = self._create_temp_file(content1)
-        path2 = self._create_temp_file(content2)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b"line with @new\n")
+        self.assertEqual(os.listdir(directory), ["test_x.py"])
+        print("✓ File in read-only directory updated in place")
 
-        finder = self._get_finder([path1, path2])
-        
-        with patch('builtins.input', side_effect=['y', 'n']):
-            modified = finder.bulk_replace("@old", "@new", dry_run=False, bulk_confirm=False)
+    def test_bulk_write_updates_every_hardlink(self):
+        """Test files with several hardlinks are rewritten in place, so every link sees the change"""
+        path = self._create_temp_file(_CONTENT_OLD)
+        other = os.path.join(self._td.name, "other_link")
+        os.link(path, other)
+        finder = self._get_finder([path])
 
-        self.assertEqual(modified, 1)
-        print(f"✓ Modified {modified} files with individual confirmations")
+        type(self)._answers = itertools.repeat('y')
+        self.assertEqual(finder.bulk_replace("@old", "@new", bulk_confirm=True), 1)
 
-    def test_bulk_confirm_with_dry_run(self):
-        """Test dry run behavior"""
-        content = "line with @old\n"
-        path = self._create_temp_file(content)
+        with open(other, 'rb') as f:
+            self.assertEqual(f.read(), b"line with @new\n")
+        self.assertTrue(os.path.samefile(path, other))
+        print("✓ Hardlinks kept in sync")
 
+    def test_bulk_write_failure_removes_temp_file(self):
+        """Test a failed write leaves the original file and no temp file behind"""
+        path = self._create_temp_file(_CONTENT_OLD)
         finder = self._get_finder([path])
-        
-        with patch('builtins.input', return_value='y'):
-            modified = finder.bulk_replace("@old", "@new", dry_run=True, bulk_confirm=True)
 
-        self.assertEqual(modified, 0)
-        print("✓ Dry run completed without modifications")
+        type(self)._answers = itertools.repeat('y')
+        with patch('perseus.os.replace', side_effect=OSError("disk full")):
+            self.assertEqual(finder.bulk_replace("@old", "@new", bulk_confirm=True), 0)
+
+        self.assertEqual(os.listdir(self._td.name), [os.path.basename(path)])
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), _CONTENT_OLD)
+        print("✓ Temp file cleaned up after a failed write")
 
     def test_bulk_confirm_with_remove_lines(self):
         """Test bulk line removal"""
-        content = "keep\nremove this\nkeep\n"
-        path = self._create_temp_file(content)
+        path = self._create_temp_file(_CONTENT_KEEP_REMOVE)
 
         finder = self._get_finder([path])
         
-        with patch('builtins.input', return_value='y'):
-            modified = finder.bulk_remove_lines("remove", dry_run=False, bulk_confirm=True)
+        type(self)._answers = itertools.repeat('y')
+        modified = finder.bulk_remove_lines("remove", dry_run=False, bulk_confirm=True)
 
         self.assertEqual(modified, 1)
         print("✓ Bulk line removal successful")
 
     def test_bulk_confirm_with_add_after(self):
         """Test bulk line addition"""
-        content = "line\nmatch\nnext\n"
-        path = self._create_temp_file(content)
+        path = self._create_temp_file(_CONTENT_MATCH)
 
         finder = self._get_finder([path])
         
-        with patch('builtins.input', return_value='y'):
-            modified = finder.bulk_add_after("match", "added", dry_run=False, bulk_confirm=True)
+        type(self)._answers = itertools.repeat('y')
+        modified = finder.bulk_add_after("match", "added", dry_run=False, bulk_confirm=True)
 
         self.assertEqual(modified, 1)
         print("✓ Bulk line addition successful")
 
+    def test_line_operations_rewrite_whole_lines(self):
+        """Test line removal and replacement output, including the non-regex fallbacks"""
+        cases = [
+            # (case, method, args, content, expected)
+            ("remove ignoring case", "bulk_remove_lines", ("REMOVE",),
+             b"keep\nRemove this\nkeep\n", b"keep\nkeep\n"),
+            ("remove unterminated last line", "bulk_remove_lines", ("remove",),
+             b"keep\nremove this", b"keep\n"),
+            ("remove in CRLF file", "bulk_remove_lines", ("remove",),
+             b"keep\r\nremove this\r\nkeep\r\n", b"keep\r\nkeep\r\n"),
+            ("remove in CR file", "bulk_remove_lines", ("remove",),
+             b"keep\rremove this\rkeep\r", b"keep\rkeep\r"),
+            ("remove empty keyword", "bulk_remove_lines", ("",),
+             b"a\nb\n", b""),
+            ("remove keyword with newline", "bulk_remove_lines", ("remove\n",),
+             b"remove\nremove this\nkeep\n", b"remove this\nkeep\n"),
+            ("replace ignoring case", "bulk_replace_lines", ("old", "new"),
+             b"keep\nOLD line\n", b"keep\nnew\n"),
+            ("replace unterminated last line", "bulk_replace_lines", ("old", "new"),
+             b"keep\nold line", b"keep\nnew\n"),
+            ("replace in CRLF file", "bulk_replace_lines", ("old", "new"),
+             b"keep\r\nold\r\nkeep\r\n", b"keep\r\nnew\r\nkeep\r\n"),
+            ("replace empty keyword", "bulk_replace_lines", ("", "new"),
+             b"a\nb\n", b"new\nnew\n"),
+            ("replace keyword with newline", "bulk_replace_lines", ("old\n", "new"),
+             b"old\nold x\n", b"new\nold x\n"),
+        ]
+        for name, method, args, content, expected in cases:
+            with self.subTest(case=name):
+                path = self._create_temp_file(content)
+                finder = self._get_finder([path])
+
+                type(self)._answers = itertools.repeat('y')
+                self.assertEqual(getattr(finder, method)(*args, bulk_confirm=True), 1)
+
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), expected)
+        print("✓ Whole lines removed and replaced")
+
+    def test_add_lines_first_only(self):
+        """Test first_only inserts a single line, at the first of several matching lines"""
+        content = b"@mark\ndef a():\n@mark\ndef b():\n"
+        cases = [
+            ("bulk_add_after", b"@mark\nx\ndef a():\n@mark\ndef b():\n"),
+            ("bulk_add_before", b"x\n@mark\ndef a():\n@mark\ndef b():\n"),
+        ]
+        for method, expected in cases:
+            with self.subTest(method=method):
+                path = self._create_temp_file(content)
+                finder = self._get_finder([path])
+
+                type(self)._answers = itertools.repeat('y')
+                self.assertEqual(getattr(finder, method)("@mark", "x", first_only=True, bulk_confirm=True), 1)
+
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), expected)
+        print("✓ first_only inserted one line")
+
+    def test_inserted_lines_follow_file_line_endings(self):
+        """Test added and replaced lines take the CRLF endings of the file they go into"""
+        cases = [
+            ("add_keyword",
+             lambda f: f.bulk_add_keyword("# slow", lambda line: line.startswith("def"), bulk_confirm=True),
+             b"@mark\r\n# slow\r\ndef test():\r\n    pass\r\n"),
+            ("replace_lines", lambda f: f.bulk_replace_lines("pass", "    return\n", bulk_confirm=True),
+             b"@mark\r\ndef test():\r\n    return\r\n"),
+            ("add_after", lambda f: f.bulk_add_after("@mark", "@pytest.mark.slow", bulk_confirm=True),
+             b"@mark\r\n@pytest.mark.slow\r\ndef test():\r\n    pass\r\n"),
+            ("add_before", lambda f: f.bulk_add_before("def", "@pytest.mark.slow", bulk_confirm=True),
+             b"@mark\r\n@pytest.mark.slow\r\ndef test():\r\n    pass\r\n"),
+        ]
+        for name, operation, expected in cases:
+            with self.subTest(operation=name):
+                path = self._create_temp_file(_CONTENT_CRLF)
+                finder = self._get_finder([path])
+
+                type(self)._answers = itertools.repeat('y')
+                self.assertEqual(operation(finder), 1)
+
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), expected)
+        print("✓ Inserted lines kept CRLF endings")
+
+    def test_find_matches_requires_all_keywords(self):
+        """Test search keeps only files containing every keyword, reporting matching lines"""
+        root = self._create_search_tree({
+            "test_both.py": "import pytest\n@Mark1\ndef test_a():\n    pass  # @mark2 @mark1\n",
+            "test_one.py": "@mark1\ndef test_b():\n    pass\n",
+            "pkg/sub_test.py": "@MARK2\n\n@mark1\n",
+            "helper.py": "@mark1 @mark2\n",
+        })
+
+        finder = Perseus(root, ["@mark1", "@mark2"])
+        matches = finder.find_matches()
+
+        self.assertEqual(set(matches), {os.path.join(root, "test_both.py"),
+                                        os.path.join(root, "pkg", "sub_test.py")})
+        self.assertEqual(matches[os.path.join(root, "test_both.py")],
+                         [(2, "@Mark1"), (4, "pass  # @mark2 @mark1")])
+        self.assertEqual(matches[os.path.join(root, "pkg", "sub_test.py")], [(1, "@MARK2"), (3, "@mark1")])
+        print("✓ Found files containing all keywords")
+
+    def test_find_matches_skips_excluded(self):
+        """Test search drops files containing an excluded keyword"""
+        root = self._create_search_tree({
+            "test_keep.py": "@mark1\n",
+            "test_drop.py": "@mark1\n@Skip\n",
+        })
+
+        finder = Perseus(root, ["@mark1"], exclude_keywords=["@skip"])
+        matches = finder.find_matches()
+
+        self.assertEqual(list(matches), [os.path.join(root, "test_keep.py")])
+        print("✓ Excluded files were skipped")
+
+    def test_find_matches_non_ascii_keywords_ignore_case(self):
+        """Test non-ASCII keywords still match regardless of case"""
+        root = self._create_search_tree({
+            "test_upper.py": "# ÜBER @Mark\n",
+            "test_other.py": "# uber\n",
+        })
+
+        finder = Perseus(root, ["über"])
+        matches = finder.find_matches()
+
+        self.assertEqual(matches, {os.path.join(root, "test_upper.py"): [(1, "# ÜBER @Mark")]})
+        print("✓ Non-ASCII keywords matched case-insensitively")
+
+    def test_find_matches_reads_large_files_through_mmap(self):
+        """Test files past MMAP_THRESHOLD are matched, and sniffed for NULs, from a memory map"""
+        padding = "x = 1\n" * 20000
+        self.assertGreaterEqual(len(padding), MMAP_THRESHOLD)
+        root = self._create_search_tree({
+            "test_large.py": padding + "# Über\n",
+            "test_large_binary.py": "\x00\n" + padding + "# Über\n",
+        })
+
+        with patch('perseus.mmap.mmap', wraps=mmap.mmap) as mapped:
+            matches = Perseus(root, ["über"]).find_matches()
+
+        self.assertEqual(matches, {os.path.join(root, "test_large.py"): [(20001, "# Über")]})
+        self.assertEqual(mapped.call_count, 2)
+        print("✓ Large files matched through mmap")
+
+    def test_find_matches_numbers_lines_like_readlines(self):
+        """Test search counts lone CR and CRLF as line endings, as the bulk operations do"""
+        root = self._create_search_tree({
+            "test_cr.py": "x = 1\r@mark\r",
+            "test_crlf.py": "x = 1\r\n\r\n@mark über\r\n",
+        })
+
+        for keyword in ("@mark", "über"):
+            with self.subTest(keyword=keyword):
+                matches = Perseus(root, [keyword]).find_matches()
+
+                self.assertEqual(matches.get(os.path.join(root, "test_crlf.py")), [(3, "@mark über")])
+                if keyword == "@mark":
+                    self.assertEqual(matches[os.path.join(root, "test_cr.py")], [(2, "@mark")])
+        print("✓ Line numbers counted across CR and CRLF endings")
+
+    def test_find_matches_parallel_same_as_serial(self):
+        """Test parallel search returns the same matches, in the same order, as a serial one"""
+        root = self._create_search_tree({
+            f"dir{i % 3}/test_{i}.py": ("@mark\n" if i % 2 else "plain\n") * (i + 1) for i in range(20)
+        })
+
+        serial = Perseus(root, ["@mark"], workers=1).find_matches()
+        parallel = Perseus(root, ["@mark"], workers=8).find_matches()
+
+        self.assertEqual(len(serial), 10)
+        self.assertEqual(list(parallel.items()), list(serial.items()))
+        print("✓ Parallel search matched serial search")
+
+    def test_find_matches_skips_large_and_binary_files(self):
+        """Test search ignores files over the size limit and files that look binary"""
+        root = self._create_search_tree({
+            "test_small.py": "@mark\n",
+            "test_large.py": "@mark\n" + "x" * 100,
+            "test_binary.py": "@mark\n\x00\n",
+        })
+
+        finder = Perseus(root, ["@mark"], max_bytes=50)
+        matches = finder.find_matches()
+
+        self.assertEqual(list(matches), [os.path.join(root, "test_small.py")])
+        print("✓ Large and binary files were skipped")
+
+    def test_chained_bulk_operations_after_search(self):
+        """Test bulk operations after a search see each other's changes"""
+        root = self._create_search_tree({"test_chain.py": "line with @old\r\nkeep\r\n"})
+        path = os.path.join(root, "test_chain.py")
+
+        finder = Perseus(root, ["@old"])
+        finder.find_matches()
+
+        type(self)._answers = itertools.repeat('y')
+        self.assertEqual(finder.bulk_replace("@old", "@new", dry_run=False, bulk_confirm=True), 1)
+        self.assertEqual(finder.bulk_replace("@new", "@newer", dry_run=False, bulk_confirm=True), 1)
+
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b"line with @newer\r\nkeep\r\n")
+        print("✓ Chained operations applied on top of each other")
+
+    def test_show_changes_renders_unified_hunks(self):
+        """Test diff preview shows changed lines with two lines of context"""
+        finder = self._get_finder([])
+        old = "a\nb\nc\n@old\nd\ne\nf\n"
+
+        with patch('sys.stdout', new_callable=StringIO) as out:
+            finder._show_changes(old, old.replace("@old", "@new"))
+
+        self.assertIn("@@ -2,5 +2,5 @@\n b\n c\n", out.getvalue())
+        self.assertIn("-@old\n", out.getvalue())
+        self.assertIn("+@new\n", out.getvalue())
+        self.assertNotIn(" a\n", out.getvalue())
+        print("✓ Diff preview rendered")
+
+    def test_show_changes_renders_inserted_and_removed_lines(self):
+        """Test diff preview of edits that change the line count, as line additions and removals do"""
+        finder = self._get_finder([])
+        cases = [
+            # (edit, old, new, hunk header with leading context, changed line, trailing context)
+            ("insert", "a\nb\nc\n", "a\nx\nb\nc\n", "@@ -1,3 +1,4 @@\n a\n", "+x\n", " b\n c\n"),
+            ("remove", "a\nb\nc\nd\n", "a\nc\nd\n", "@@ -1,4 +1,3 @@\n a\n", "-b\n", " c\n d\n"),
+        ]
+        for name, old, new, header, changed, trailing in cases:
+            with self.subTest(edit=name):
+                with patch('sys.stdout', new_callable=StringIO) as out:
+                    finder._show_changes(old, new)
+
+                self.assertIn(header, out.getvalue())
+                self.assertIn(changed, out.getvalue())
+                self.assertTrue(out.getvalue().endswith(trailing))
+        print("✓ Diff preview rendered insertions and removals")
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)